@@ -1,10 +1,23 @@
 import argparse
+import hashlib
+import json
 import os
 import re
+import stat
 import subprocess
 import sys
+import time
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Dict, Iterable, List, Optional, Sequence, Set, Tuple
+from typing import Any, Container, Dict, FrozenSet, Iterable, Iterator, List, Optional, Sequence, Set, Tuple
+
+from gitscan import __version__
+
+try:
+    # Optional: RE2 matches in linear time, removing the backtracking worst case
+    import re2 as _rex
+except ImportError:
+    _rex = re
 
 
 GITS_CAN_EMOJI_UNSAFE = "\u26a0\ufe0f"  # ⚠️
@@ -21,8 +34,16 @@ class RepoState:
     staged_files: List[str]
     modified_files: List[str]
     untracked_files: List[str]
-    tracked_files: List[str]
     rebase_in_progress: bool
+    # Loaded lazily by make_suggestions; `git ls-files` is only needed for junk detection
+    tracked_files: Optional[List[str]] = None
+    git_dir: str = ""
+    # Which of ADD_SCOPE_DIRS exist at the repo root; scanned on demand when None
+    root_dirs: Optional[FrozenSet[str]] = None
+    # Secret scan result restored from the on-disk cache, if still valid
+    secret_hits: Optional[List[Tuple[str, str]]] = None
+    # Fingerprint to store with this state; None when it came from the cache unchanged
+    cache_key: Optional[List[Any]] = None
 
 
 def run_git(args: Sequence[str], cwd: Optional[str] = None, check: bool = False) -> subprocess.CompletedProcess:
@@ -36,6 +57,17 @@ def run_git(args: Sequence[str], cwd: Optional[str] = None, check: bool = False)
     )
 
 
+def run_git_bytes(args: Sequence[str], cwd: Optional[str] = None) -> subprocess.CompletedProcess:
+    # Like run_git, but stdout stays raw bytes (blob contents, NUL-separated listings)
+    return subprocess.run(
+        list(args),
+        cwd=cwd,
+        stdout=subprocess.PIPE,
+        stderr=subprocess.PIPE,
+        check=False,
+    )
+
+
 def ensure_git_repo() -> Tuple[str, bool]:
     # Returns (git_dir, is_repo)
     try:
@@ -48,70 +80,209 @@ def ensure_git_repo() -> Tuple[str, bool]:
         return ("", False)
 
 
-def get_repo_root() -> Optional[str]:
-    cp = run_git(["git", "rev-parse", "--show-toplevel"])
-    if cp.returncode != 0:
-        return None
-    return cp.stdout.strip()
+def _decode_paths(raw: bytes) -> str:
+    # surrogateescape keeps non-UTF-8 file names round-trippable instead of failing
+    return raw.decode("utf-8", "surrogateescape")
 
 
-def parse_branch_status() -> Tuple[Optional[str], int, int]:
-    # Uses short status to parse ahead/behind
-    cp = run_git(["git", "status", "-sb"])
-    if cp.returncode != 0:
-        return (None, 0, 0)
-    first = cp.stdout.splitlines()[0] if cp.stdout else ""
-    # Examples:
-    # ## main...origin/main [ahead 2]
-    # ## feature
-    branch = None
-    ahead = 0
-    behind = 0
-    if first.startswith("## "):
-        first = first[3:]
-        # Split by space to separate tracking info
-        tokens = first.split()
-        if tokens:
-            branch = tokens[0].split("...")[0]
-        m_ahead = re.search(r"\[ahead (\d+)\]", first)
-        m_behind = re.search(r"\[behind (\d+)\]", first)
-        if m_ahead:
-            ahead = int(m_ahead.group(1))
-        if m_behind:
-            behind = int(m_behind.group(1))
-    return (branch, ahead, behind)
-
-
-def list_files(cmd: Sequence[str]) -> List[str]:
-    cp = run_git(cmd)
+def list_files(cmd: Sequence[str], cwd: Optional[str] = None) -> List[str]:
+    # NUL-separated output: no quoting of unusual names, and one C-level split
+    cp = run_git_bytes(list(cmd) + ["-z"], cwd=cwd)
     if cp.returncode != 0:
         return []
-    return [l.strip() for l in cp.stdout.splitlines() if l.strip()]
+    return _decode_paths(cp.stdout).split("\0")[:-1]
+
+
+# Directories suggested as narrower alternatives to `git add .`
+ADD_SCOPE_DIRS: Tuple[str, ...] = ("src", "tests")
+REBASE_DIRS: FrozenSet[str] = frozenset({"rebase-apply", "rebase-merge"})
+
+
+def _subdirs_named(parent: str, names: Iterable[str]) -> FrozenSet[str]:
+    # One directory read instead of an isdir() stat per name
+    wanted = frozenset(names)
+    try:
+        with os.scandir(parent) as it:
+            return frozenset(e.name for e in it if e.name in wanted and e.is_dir())
+    except OSError:
+        return frozenset()
+
+
+def _scan_root(repo_root: str) -> FrozenSet[str]:
+    return _subdirs_named(repo_root, ADD_SCOPE_DIRS)
+
+
+def _scan_git_dir(git_dir: str) -> bool:
+    return bool(_subdirs_named(git_dir, REBASE_DIRS))
 
 
 def detect_rebase_in_progress(git_dir: str) -> bool:
     # rebase-apply or rebase-merge indicates rebase in progress
+    return _scan_git_dir(git_dir)
+
+
+def parse_porcelain_v2(
+    out: str,
+) -> Tuple[Optional[str], int, int, List[str], List[str], List[str]]:
+    # Parses `git status --porcelain=v2 --branch -z` output into
+    # (branch, ahead, behind, staged, modified, untracked)
+    branch = None
+    ahead = 0
+    behind = 0
+    staged: List[str] = []
+    modified: List[str] = []
+    untracked: List[str] = []
+    entries = iter(out.split("\0"))
+    for entry in entries:
+        if not entry:
+            continue
+        kind = entry[0]
+        if kind == "#":
+            # Examples:
+            # # branch.head main
+            # # branch.ab +2 -0
+            header = entry[2:].split(" ")
+            if header[0] == "branch.head" and len(header) > 1:
+                branch = "HEAD" if header[1] == "(detached)" else header[1]
+            elif header[0] == "branch.ab" and len(header) > 2:
+                ahead = int(header[1].lstrip("+"))
+                behind = int(header[2].lstrip("-"))
+        elif kind in ("1", "2"):
+            # 1 XY sub mH mI mW hH hI path
+            # 2 XY sub mH mI mW hH hI Xscore path\0origPath
+            fields = entry.split(" ", 9 if kind == "2" else 8)
+            path = fields[-1]
+            if kind == "2":
+                next(entries, None)  # original path of the rename/copy
+            xy = fields[1]
+            if xy[0] != ".":
+                staged.append(path)
+            if xy[1] != ".":
+                modified.append(path)
+        elif kind == "u":
+            # u XY sub m1 m2 m3 mW h1 h2 h3 path; unmerged paths show up in both diffs
+            path = entry.split(" ", 10)[-1]
+            staged.append(path)
+            modified.append(path)
+        elif kind == "?":
+            untracked.append(entry[2:])
+    return (branch, ahead, behind, staged, modified, untracked)
+
+
+CACHE_FILENAME = "gitscan-cache.json"
+# Unstaged edits do not touch the index, so a cached state is only trusted briefly.
+# Cached secret hits depend on the index alone and live as long as the fingerprint.
+CACHE_TTL_SECONDS = 5.0
+_CACHED_STATE_FIELDS: Tuple[str, ...] = (
+    "repo_root",
+    "branch",
+    "ahead",
+    "behind",
+    "staged_files",
+    "modified_files",
+    "untracked_files",
+    "rebase_in_progress",
+    "root_dirs",
+)
+
+
+def _stat_key(path: str) -> Optional[List[int]]:
     try:
-        return os.path.isdir(os.path.join(git_dir, "rebase-apply")) or os.path.isdir(
-            os.path.join(git_dir, "rebase-merge")
-        )
-    except Exception:
-        return False
+        st = os.stat(path)
+    except OSError:
+        return None
+    return [st.st_mtime_ns, st.st_size]
+
+
+def _scan_rules_digest() -> str:
+    # Cached verdicts only hold for the gitscan version and detection rules that produced them
+    rules = [__version__, _COMBINED_SECRET_PATTERN, SECRET_FILENAME_RX.pattern, _SECRET_PICKAXE]
+    rules.extend(SECRET_SUFFIXES)
+    rules.extend(atom.decode() for atom in _SECRET_ATOMS)
+    return hashlib.sha256("\0".join(rules).encode()).hexdigest()
+
+
+def repo_fingerprint(git_dir: str, index_path: str, head_oid: str) -> List[Any]:
+    # The index git actually reads (GIT_INDEX_FILE during `git commit -a` hooks), the
+    # commit HEAD resolves to and the branch it names; any change invalidates the cache.
+    # HEAD is resolved by git, so refs in a linked worktree's common dir (or any ref
+    # backend) are covered.
+    try:
+        with open(os.path.join(git_dir, "HEAD")) as fh:
+            head = fh.read().strip()
+    except OSError:
+        head = ""
+    return [index_path, _stat_key(index_path), head, head_oid, _scan_rules_digest()]
+
+
+def _read_cache(git_dir: str) -> Optional[Dict[str, Any]]:
+    try:
+        with open(os.path.join(git_dir, CACHE_FILENAME)) as fh:
+            data = json.load(fh)
+    except (OSError, ValueError):
+        return None
+    return data if isinstance(data, dict) else None
+
+
+def save_repo_cache(state: RepoState, secret_hits: List[Tuple[str, str]]) -> None:
+    if not state.git_dir or state.cache_key is None:
+        return
+    data = {
+        "key": state.cache_key,
+        "created": time.time(),
+        "state": {name: getattr(state, name) for name in _CACHED_STATE_FIELDS},
+        "secret_hits": secret_hits,
+    }
+    if state.root_dirs is not None:
+        data["state"]["root_dirs"] = sorted(state.root_dirs)
+    path = os.path.join(state.git_dir, CACHE_FILENAME)
+    tmp = f"{path}.{os.getpid()}.tmp"
+    try:
+        with open(tmp, "w") as fh:
+            json.dump(data, fh)
+        os.replace(tmp, path)
+    except OSError:
+        # Caching is best-effort (e.g. read-only repository)
+        try:
+            os.remove(tmp)
+        except OSError:
+            pass
 
 
 def get_repo_state() -> Optional[RepoState]:
-    root = get_repo_root()
-    if not root:
+    # --verify -q HEAD exits 1 without output on an unborn branch
+    cp = run_git(
+        ["git", "rev-parse", "--show-toplevel", "--git-dir", "--git-path", "index", "--verify", "-q", "HEAD"]
+    )
+    if cp.returncode not in (0, 1):
+        return None
+    lines = cp.stdout.splitlines()
+    if len(lines) < 3:
         return None
-    git_dir, ok = ensure_git_repo()
-    if not ok:
+    root, git_dir, index_path = lines[0], lines[1], os.path.abspath(lines[2])
+    head_oid = lines[3] if len(lines) > 3 else ""
+    key = repo_fingerprint(git_dir, index_path, head_oid)
+    cached = _read_cache(git_dir)
+    cached_hits: Optional[List[Tuple[str, str]]] = None
+    if cached and cached.get("key") == key:
+        try:
+            cached_hits = [(path, label) for path, label in cached["secret_hits"]]
+            if time.time() - cached["created"] <= CACHE_TTL_SECONDS:
+                fields = dict(cached["state"])
+                if fields.get("root_dirs") is not None:
+                    fields["root_dirs"] = frozenset(fields["root_dirs"])
+                return RepoState(**fields, git_dir=git_dir, secret_hits=cached_hits)
+        except (KeyError, TypeError, ValueError):
+            cached_hits = None
+    cp = run_git_bytes(["git", "status", "--porcelain=v2", "--branch", "-z", "--untracked-files=all"])
+    if cp.returncode != 0:
         return None
-    branch, ahead, behind = parse_branch_status()
-    staged = list_files(["git", "diff", "--name-only", "--cached"])
-    modified = list_files(["git", "diff", "--name-only"])
-    untracked = list_files(["git", "ls-files", "--others", "--exclude-standard"])
-    tracked = list_files(["git", "ls-files"])
+    branch, ahead, behind, staged, modified, untracked = parse_porcelain_v2(_decode_paths(cp.stdout))
     rebase = detect_rebase_in_progress(git_dir)
+    fresh_key = repo_fingerprint(git_dir, index_path, head_oid)
+    if fresh_key != key:
+        # status refreshed the index on disk; fingerprint what we actually saw
+        key, cached_hits = fresh_key, None
     return RepoState(
         repo_root=root,
         branch=branch,
@@ -120,8 +291,11 @@ def get_repo_state() -> Optional[RepoState]:
         staged_files=staged,
         modified_files=modified,
         untracked_files=untracked,
-        tracked_files=tracked,
         rebase_in_progress=rebase,
+        git_dir=git_dir,
+        root_dirs=_scan_root(root),
+        secret_hits=cached_hits,
+        cache_key=key,
     )
 
 
@@ -140,15 +314,13 @@ JUNK_SUFFIXES: Tuple[str, ...] = (
     ".pyo",
     ".pyd",
 )
-JUNK_EXACT: Set[str] = {
+JUNK_EXACT: FrozenSet[str] = frozenset({
     ".DS_Store",
-}
+})
 
 
-SECRET_FILENAME_CUES: Tuple[str, ...] = (
-    ".env",
-    "id_rsa",
-)
+# Lower-cased base names: .env and its variants (.env.local, .env-prod, .envrc), id_rsa
+SECRET_FILENAME_RX = re.compile(r"(?:\.env(?:rc|[._-].*)?|id_rsa)\Z", re.DOTALL)
 SECRET_SUFFIXES: Tuple[str, ...] = (
     ".pem",
     ".key",
@@ -156,8 +328,11 @@ SECRET_SUFFIXES: Tuple[str, ...] = (
     ".pfx",
 )
 
+# Like git itself, treat a blob as binary if a NUL shows up in its first bytes
+BINARY_SNIFF_BYTES = 8192
+
 
-SECRET_REGEXES: List[Tuple[str, re.Pattern]] = [
+SECRET_REGEXES: Tuple[Tuple[str, re.Pattern], ...] = (
     ("AWS Access Key ID", re.compile(r"AKIA[0-9A-Z]{16}")),
     (
         "GitHub Token",
@@ -173,66 +348,460 @@ SECRET_REGEXES: List[Tuple[str, re.Pattern]] = [
     ),
     (
         "Generic Secret assignment",
-        re.compile(r"(?i)(secret|password|token|api[_-]?key)\s*[:=]\s*['\"]?[A-Za-z0-9_\-/.+=]{20,}"),
+        # Case-insensitive only on the keyword; the value class already covers both cases.
+        # The value is capped so a huge unbroken token cannot drag the match along.
+        # The quote is written as \x22 so the pattern also compiles in ripgrep, whose
+        # regex engine rejected escapes like \" before regex 1.8.
+        re.compile(r"(?i:secret|password|token|api[_-]?key)\s*[:=]\s*['\x22]?[A-Za-z0-9_\-/.+=]{20,200}"),
     ),
-]
+)
+
+
+def _scoped_pattern(pattern: str) -> str:
+    # Leading global flags like (?i) are only legal at the start of an expression;
+    # turn them into a scoped group so the pattern can be embedded in an alternation.
+    m = re.match(r"\(\?([aiLmsux]+)\)", pattern)
+    if m:
+        return f"(?{m.group(1)}:{pattern[m.end():]})"
+    return pattern
+
+
+# One named group per pattern so a single pass finds any of them; the tags are
+# positional, so they cannot collide with groups inside the patterns themselves.
+# The syntax is also understood by RE2 and ripgrep (see scan_tree_with_rg).
+_COMBINED_SECRET_PATTERN = "|".join(
+    f"(?P<_s{idx}>{_scoped_pattern(rx.pattern)})" for idx, (_, rx) in enumerate(SECRET_REGEXES)
+)
+
+
+def _combine_secret_regexes() -> Tuple[Optional[Any], Tuple[Tuple[str, str], ...]]:
+    tag_to_label = tuple((f"_s{idx}", label) for idx, (label, _) in enumerate(SECRET_REGEXES))
+    combined = _COMBINED_SECRET_PATTERN
+    engines = (_rex, re) if _rex is not re else (re,)
+    for engine in engines:
+        try:
+            return (engine.compile(combined), tag_to_label)
+        except Exception:
+            continue
+    return (None, tag_to_label)
+
+
+_COMBINED_SECRET_RX, _SECRET_TAGS = _combine_secret_regexes()
+
+
+def find_secret_label(text: str) -> Optional[str]:
+    if _COMBINED_SECRET_RX is not None:
+        m = _COMBINED_SECRET_RX.search(text)
+        if not m:
+            return None
+        # Not every engine exposes lastgroup; check the (few) tags directly
+        group = m.group
+        for tag, label in _SECRET_TAGS:
+            if group(tag) is not None:
+                return label
+        return None
+    # Fallback: per-pattern search if the combined pattern did not compile
+    for label, rx in SECRET_REGEXES:
+        if rx.search(text):
+            return label
+    return None
+
+
+def _junk_alternation(names: Iterable[str]) -> str:
+    return "|".join(re.escape(n) for n in names)
+
+
+# One match classifies a path against all junk rules. Each rule is an optional
+# lookahead, so a path can hit several (e.g. venv/x.pyc) without backtracking
+# into a different branch.
+_JUNK_RX = re.compile(
+    rf"(?:(?=(?P<pre>{_junk_alternation(p.rstrip('/') for p in JUNK_PREFIXES)})/))?"
+    rf"(?:(?=.*(?P<suf>{_junk_alternation(JUNK_SUFFIXES)})\Z))?"
+    rf"(?:(?=(?:.*/)?(?P<exact>{_junk_alternation(JUNK_EXACT)})\Z))?",
+    re.DOTALL,
+)
 
 
 def detect_tracked_junk(tracked_files: Iterable[str]) -> Dict[str, Set[str]]:
     # Returns {pattern: {files}}
     found: Dict[str, Set[str]] = {}
+    match = _JUNK_RX.match
     for path in tracked_files:
-        base = os.path.basename(path)
-        if base in JUNK_EXACT:
-            found.setdefault(base, set()).add(path)
-        for pref in JUNK_PREFIXES:
-            if path.startswith(pref):
-                found.setdefault(pref + "*", set()).add(path)
-        for suf in JUNK_SUFFIXES:
-            if path.endswith(suf):
-                found.setdefault("*" + suf, set()).add(path)
+        m = match(path)
+        if m.lastindex is None:
+            continue
+        pre, suf, exact = m.group("pre", "suf", "exact")
+        if exact:
+            found.setdefault(exact, set()).add(path)
+        if pre:
+            found.setdefault(pre + "/*", set()).add(path)
+        if suf:
+            found.setdefault("*" + suf, set()).add(path)
     return found
 
 
-def git_show_staged(path: str) -> Optional[bytes]:
-    cp = run_git(["git", "show", f":{path}"])
+class CatFileBatch:
+    """Reads staged blobs through one long-lived `git cat-file --batch` process.
+
+    The process is started on the first read, so callers that never need blob
+    contents do not pay for it.
+    """
+
+    def __init__(self, cwd: Optional[str] = None) -> None:
+        self._cwd = cwd
+        self._proc: Optional[subprocess.Popen] = None
+
+    def __enter__(self) -> "CatFileBatch":
+        return self
+
+    def __exit__(self, *exc: object) -> None:
+        self.close()
+
+    def read(self, path: str, skip_binary: bool = False) -> Optional[bytes]:
+        # With skip_binary, a blob with a NUL in its first BINARY_SNIFF_BYTES is
+        # returned as just that head; the rest is discarded so the stream stays framed.
+        if "\n" in path:
+            # The batch protocol is line-based; request such paths one-shot instead
+            return git_show_staged(path, skip_binary=skip_binary)
+        try:
+            if self._proc is None:
+                self._proc = subprocess.Popen(
+                    ["git", "cat-file", "--batch"],
+                    cwd=self._cwd,
+                    stdin=subprocess.PIPE,
+                    stdout=subprocess.PIPE,
+                    stderr=subprocess.DEVNULL,
+                )
+            assert self._proc.stdin is not None and self._proc.stdout is not None
+            self._proc.stdin.write(f":{path}\n".encode("utf-8", "surrogateescape"))
+            self._proc.stdin.flush()
+            # "<oid> <type> <size>" or "<object> missing"
+            header = self._proc.stdout.readline().split()
+            if len(header) != 3 or not header[2].isdigit():
+                return None
+            size = int(header[2])
+            body = self._proc.stdout.read(min(size, BINARY_SNIFF_BYTES))
+            if skip_binary and b"\x00" in body:
+                remaining = size - len(body)
+            else:
+                body += self._proc.stdout.read(size - len(body))
+                remaining = 0
+            remaining += 1  # trailing newline
+            while remaining > 0:
+                chunk = self._proc.stdout.read(min(remaining, 1 << 16))
+                if not chunk:
+                    break
+                remaining -= len(chunk)
+        except OSError:
+            return None
+        if header[1] != b"blob":
+            return None
+        return body
+
+    def close(self) -> None:
+        proc, self._proc = self._proc, None
+        if proc is None:
+            return
+        try:
+            assert proc.stdin is not None
+            proc.stdin.close()
+        except OSError:
+            pass
+        proc.wait()
+        if proc.stdout is not None:
+            proc.stdout.close()
+
+
+# Every staged blob read goes through here. Replacements (e.g. test fakes) must
+# accept (path, batch=None, skip_binary=False); the old one-argument form is gone.
+def git_show_staged(
+    path: str, batch: Optional[CatFileBatch] = None, skip_binary: bool = False
+) -> Optional[bytes]:
+    if batch is not None:
+        return batch.read(path, skip_binary)
+    cp = run_git_bytes(["git", "show", f":{path}"])
     if cp.returncode != 0:
         return None
-    # Return raw bytes; subprocess was text=True, but decode back for null detection
-    return cp.stdout.encode(errors="ignore")
+    # Raw blob bytes, as needed for null detection
+    return cp.stdout
+
+
+# Lower-cased literals that every SECRET_REGEXES match contains. Blobs without any of
+# them are skipped by a plain substring search; otherwise only lines holding one are
+# handed to the regex.
+_SECRET_ATOMS: Tuple[bytes, ...] = (
+    b"akia",
+    b"ghp_",
+    b"gho_",
+    b"ghu_",
+    b"ghs_",
+    b"ghr_",
+    b"xox",
+    b"-----begin",
+    b"secret",
+    b"password",
+    b"token",
+    b"api_key",
+    b"api-key",
+    b"apikey",
+)
 
 
-def detect_secrets_in_staged(staged_files: Iterable[str]) -> List[Tuple[str, str]]:
+# A line that only continues `key = value` across line breaks: blank, or just the
+# separator and/or opening quote
+_CONTINUATION_LINE_RX = re.compile(rb"\s*[:=]?\s*['\"]?\s*\Z")
+
+
+def _candidate_lines(content: bytes) -> Iterator[bytes]:
+    # Yields each line containing an atom, extended over following lines until one
+    # with real content (the value) is included, since `key`, `=` and the value
+    # may sit on separate lines.
+    lowered = content.lower()
+    find, rfind, size = lowered.find, lowered.rfind, len(lowered)
+    continuation = _CONTINUATION_LINE_RX.match
+    seen: Set[int] = set()
+    for atom in _SECRET_ATOMS:
+        pos = find(atom)
+        while pos != -1:
+            start = rfind(b"\n", 0, pos) + 1
+            end = find(b"\n", pos)
+            if end == -1:
+                end = size
+            if start not in seen:
+                seen.add(start)
+                window_end = end
+                while window_end < size:
+                    line_end = find(b"\n", window_end + 1)
+                    if line_end == -1:
+                        line_end = size
+                    line_start, window_end = window_end + 1, line_end
+                    if not continuation(lowered, line_start, line_end):
+                        break
+                yield content[start:window_end]
+            pos = find(atom, end)
+
+
+def find_secret_label_in_blob(content: bytes) -> Optional[str]:
+    for window in _candidate_lines(content):
+        label = find_secret_label(window.decode(errors="ignore"))
+        if label:
+            return label
+    return None
+
+
+# Staged files per cat-file process before the scan is spread across threads
+SECRET_SCAN_SHARD_SIZE = 16
+SECRET_SCAN_MAX_WORKERS = 8
+
+
+# ERE for `git diff -G`: the same atoms as _SECRET_ATOMS, matched case-insensitively
+_SECRET_PICKAXE = "AKIA|gh[pousr]_|xox|-----BEGIN|secret|password|token|api[_-]?key"
+
+
+def atom_filtered_staged() -> Optional[Set[str]]:
+    # Staged files whose changed lines mention a secret atom; None if git cannot tell
+    # --text/--no-textconv: -G otherwise skips paths .gitattributes marks -diff or binary,
+    # and would match textconv output instead of the staged bytes.
+    # --no-relative: diff.relative=true would otherwise limit output to the cwd
+    # (git without the flag exits non-zero, which falls back to a full scan)
+    cp = run_git_bytes(
+        [
+            "git",
+            "diff",
+            "--cached",
+            "--no-relative",
+            "--name-only",
+            "-z",
+            "--text",
+            "--no-textconv",
+            "--regexp-ignore-case",
+            f"-G{_SECRET_PICKAXE}",
+        ]
+    )
+    if cp.returncode != 0:
+        return None
+    return set(_decode_paths(cp.stdout).split("\0")[:-1])
+
+
+def detect_secrets_in_staged(
+    staged_files: Iterable[str], content_paths: Optional[Container[str]] = None
+) -> List[Tuple[str, str]]:
+    # Name-based cues apply to every staged file; blob contents are only read for
+    # content_paths when given (see atom_filtered_staged)
+    paths = list(staged_files)
+    workers = min(SECRET_SCAN_MAX_WORKERS, -(-len(paths) // SECRET_SCAN_SHARD_SIZE))
+    if workers <= 1:
+        return _scan_staged_shard(paths, content_paths)
+    # Contiguous shards, each with its own cat-file pipe, so results keep input order.
+    # Blob reads happen in the git processes, which run in parallel outside the GIL.
+    size = -(-len(paths) // workers)
+    shards = [paths[i : i + size] for i in range(0, len(paths), size)]
+    with ThreadPoolExecutor(max_workers=len(shards)) as ex:
+        results = list(ex.map(lambda shard: _scan_staged_shard(shard, content_paths), shards))
+    return [hit for shard_hits in results for hit in shard_hits]
+
+
+def _scan_staged_shard(
+    paths: Sequence[str], content_paths: Optional[Container[str]] = None
+) -> List[Tuple[str, str]]:
     issues: List[Tuple[str, str]] = []
-    for path in staged_files:
-        lower = path.lower()
-        base = os.path.basename(lower)
-        if base in SECRET_FILENAME_CUES or base.startswith(".env"):
-            issues.append((path, "Suspicious filename"))
-            continue
+    with CatFileBatch() as batch:
+        for path in paths:
+            _scan_staged_file(path, batch, issues, content_paths is None or path in content_paths)
+    return issues
+
+
+def _scan_staged_file(
+    path: str, batch: CatFileBatch, issues: List[Tuple[str, str]], scan_content: bool = True
+) -> None:
+    lower = path.lower()
+    base = os.path.basename(lower)
+    if SECRET_FILENAME_RX.match(base):
+        issues.append((path, "Suspicious filename"))
+        return
+    if lower.endswith(SECRET_SUFFIXES):
         for suf in SECRET_SUFFIXES:
             if lower.endswith(suf):
                 issues.append((path, f"File suffix suggests secret ({suf})"))
                 break
-        content = git_show_staged(path)
-        if not content:
+    if not scan_content:
+        return
+    content = git_show_staged(path, batch, skip_binary=True)
+    if not content:
+        return
+    if b"\x00" in content[:BINARY_SNIFF_BYTES]:
+        # Probably binary; skip content regex (the batch did not read the rest)
+        return
+    label = find_secret_label_in_blob(content)
+    if label:
+        issues.append((path, label))
+
+
+# Upper bound on path bytes handed to one rg invocation, well below ARG_MAX
+_RG_ARGS_BYTES = 256 * 1024
+
+
+def tree_scan_paths(repo_root: str) -> List[str]:
+    # Tracked plus untracked-but-not-ignored files. Tracked files stay in even if an
+    # ignore rule matches them (e.g. a committed .env added to .gitignore later).
+    paths: List[str] = []
+    for path in list_files(["git", "ls-files", "--cached", "--others", "--exclude-standard"], cwd=repo_root):
+        try:
+            # Don't follow symlinks: they may point outside the repo or at a device
+            # such as /dev/tty that would block the read. Deleted files and
+            # submodules drop out here too.
+            if stat.S_ISREG(os.lstat(os.path.join(repo_root, path)).st_mode):
+                paths.append(path)
+        except OSError:
             continue
-        if b"\x00" in content:
-            # Probably binary; skip content regex
+    return paths
+
+
+def _rg_chunks(paths: Sequence[str]) -> Iterator[List[str]]:
+    chunk: List[str] = []
+    size = 0
+    for path in paths:
+        if chunk and size + len(path) + 1 > _RG_ARGS_BYTES:
+            yield chunk
+            chunk, size = [], 0
+        chunk.append(path)
+        size += len(path) + 1
+    if chunk:
+        yield chunk
+
+
+def scan_tree_with_rg(repo_root: str, paths: Optional[Sequence[str]] = None) -> Optional[List[Tuple[str, str]]]:
+    # Sweep via ripgrep over exactly the tree_scan_paths set, so both scanners see
+    # the same files. Returns None when rg is not installed or fails, so callers
+    # can fall back.
+    if paths is None:
+        paths = tree_scan_paths(repo_root)
+    hits: List[Tuple[str, str]] = []
+    seen: Set[str] = set()
+    for chunk in _rg_chunks(paths):
+        try:
+            cp = subprocess.run(
+                [
+                    "rg",
+                    # Ignore RIPGREP_CONFIG_PATH; user flags could change matching or output
+                    "--no-config",
+                    # The file set comes from git; don't let ignore files filter it again
+                    "--no-ignore",
+                    "--null",
+                    "--no-heading",
+                    "--with-filename",
+                    "--no-line-number",
+                    "--only-matching",
+                    "--regexp",
+                    _COMBINED_SECRET_PATTERN,
+                    "--",
+                    *chunk,
+                ],
+                cwd=repo_root,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.PIPE,
+                check=False,
+            )
+        except OSError:
+            return None
+        # rg exits 1 when nothing matched
+        if cp.returncode not in (0, 1):
+            return None
+        # Each line is "<path>\0<matched text>"
+        for line in cp.stdout.splitlines():
+            raw_path, sep, match = line.partition(b"\0")
+            if not sep:
+                continue
+            path = _decode_paths(raw_path)
+            if path in seen:
+                continue
+            label = find_secret_label(match.decode(errors="ignore"))
+            if label:
+                seen.add(path)
+                hits.append((path, label))
+    return hits
+
+
+def _scan_tree_python(repo_root: str, paths: Sequence[str]) -> List[Tuple[str, str]]:
+    hits: List[Tuple[str, str]] = []
+    for path in paths:
+        try:
+            with open(os.path.join(repo_root, path), "rb") as fh:
+                head = fh.read(BINARY_SNIFF_BYTES)
+                if b"\x00" in head:
+                    continue
+                content = head + fh.read()
+        except OSError:
             continue
-        text = content.decode(errors="ignore")
-        for label, rx in SECRET_REGEXES:
-            if rx.search(text):
-                issues.append((path, label))
-                break
-    return issues
-
-
-def dir_exists_in_repo_root(repo_root: str, dirname: str) -> bool:
-    return os.path.isdir(os.path.join(repo_root, dirname))
-
-
-def make_suggestions(state: RepoState, override_danger: bool) -> Tuple[List[str], List[str]]:
+        label = find_secret_label_in_blob(content)
+        if label:
+            hits.append((path, label))
+    return hits
+
+
+def scan_tree(repo_root: str) -> List[Tuple[str, str]]:
+    paths = tree_scan_paths(repo_root)
+    hits = scan_tree_with_rg(repo_root, paths)
+    if hits is None:
+        hits = _scan_tree_python(repo_root, paths)
+    return hits
+
+
+def load_tracked_files(state: RepoState) -> List[str]:
+    # `git ls-files` can be huge on monorepos; realize it only when needed, once
+    if state.tracked_files is None:
+        state.tracked_files = list_files(["git", "ls-files"])
+    return state.tracked_files
+
+
+def make_suggestions(
+    state: RepoState,
+    override_danger: bool,
+    fast: bool = False,
+    full_scan: bool = False,
+    tree_hits: Sequence[Tuple[str, str]] = (),
+) -> Tuple[List[str], List[str], List[Tuple[str, str]]]:
+    # Returns (issues, suggestions, secret_hits); callers reuse the hits instead of rescanning
     issues: List[str] = []
     suggestions: List[str] = []
 
@@ -253,10 +822,11 @@ def make_suggestions(state: RepoState, override_danger: bool) -> Tuple[List[str]
     if state.untracked_files or state.modified_files:
         issues.append(f"{GITS_CAN_EMOJI_UNSAFE} Avoid 'git add .'. It may stage junk or secrets.")
         add_alternatives: List[str] = ["git add -p"]
-        if dir_exists_in_repo_root(state.repo_root, "src"):
-            add_alternatives.append("git add src/")
-        if dir_exists_in_repo_root(state.repo_root, "tests"):
-            add_alternatives.append("git add tests/")
+        if state.root_dirs is None:
+            state.root_dirs = _scan_root(state.repo_root)
+        for dirname in ADD_SCOPE_DIRS:
+            if dirname in state.root_dirs:
+                add_alternatives.append(f"git add {dirname}/")
         suggestions.append("Prefer: " + ", ".join(add_alternatives))
 
     # Discourage stash
@@ -265,17 +835,23 @@ def make_suggestions(state: RepoState, override_danger: bool) -> Tuple[List[str]
             "Discouraged: git stash. Prefer saving work with a branch: git checkout -b <name>"
         )
 
-    # .gitignore hygiene
-    junk = detect_tracked_junk(state.tracked_files)
-    if junk:
-        issues.append(f"{GITS_CAN_EMOJI_UNSAFE} Tracked junk detected that should be in .gitignore.")
-        add_lines = sorted(junk.keys())
-        suggestions.append(
-            "Add to .gitignore: " + ", ".join(add_lines)
-        )
+    # .gitignore hygiene; --fast skips it so the tracked file list is never built
+    if not fast:
+        junk = detect_tracked_junk(load_tracked_files(state))
+        if junk:
+            issues.append(f"{GITS_CAN_EMOJI_UNSAFE} Tracked junk detected that should be in .gitignore.")
+            add_lines = sorted(junk.keys())
+            suggestions.append(
+                "Add to .gitignore: " + ", ".join(add_lines)
+            )
 
-    # Secrets detection
-    secret_hits = detect_secrets_in_staged(state.staged_files)
+    # Secrets detection; unless full_scan, only blobs whose diff mentions an atom are read
+    secret_hits = None if full_scan else state.secret_hits
+    if secret_hits is None:
+        content_paths = None
+        if state.staged_files and not full_scan:
+            content_paths = atom_filtered_staged()
+        secret_hits = detect_secrets_in_staged(state.staged_files, content_paths=content_paths)
     if secret_hits:
         for path, label in secret_hits:
             issues.append(f"{GITS_CAN_EMOJI_UNSAFE} Potential secret in staged file: {path} ({label}).")
@@ -284,6 +860,14 @@ def make_suggestions(state: RepoState, override_danger: bool) -> Tuple[List[str]
                 "BLOCK: Unstage sensitive files and rotate credentials if leaked. Re-run with --i-know-what-im-doing to proceed at your own risk."
             )
 
+    # Working tree sweep (--scan-tree)
+    if tree_hits:
+        for path, label in tree_hits:
+            issues.append(f"{GITS_CAN_EMOJI_UNSAFE} Potential secret in working tree file: {path} ({label}).")
+        suggestions.append(
+            "Move secrets out of the repository (e.g. environment variables) and rotate any that were committed."
+        )
+
     # Merge vs Rebase messaging
     suggestions.append("Prefer merges over rebase: use 'git pull' or 'git merge'.")
 
@@ -291,11 +875,16 @@ def make_suggestions(state: RepoState, override_danger: bool) -> Tuple[List[str]
     if not issues:
         suggestions.append(f"{GITS_CAN_EMOJI_OK} No critical issues detected.")
 
-    return issues, suggestions
+    return issues, suggestions, secret_hits
+
+
+def _write_lines(lines: List[str]) -> None:
+    # One write instead of a print() (and possible flush) per line
+    sys.stdout.write("\n".join(lines) + "\n")
 
 
 def print_summary(state: RepoState, issues: List[str], suggestions: List[str]) -> None:
-    print(f"Repository: {state.repo_root}")
+    out: List[str] = [f"Repository: {state.repo_root}"]
     if state.branch:
         ahead_behind = []
         if state.ahead:
@@ -303,29 +892,31 @@ def print_summary(state: RepoState, issues: List[str], suggestions: List[str]) -
         if state.behind:
             ahead_behind.append(f"behind {state.behind}")
         ab = f" ({', '.join(ahead_behind)})" if ahead_behind else ""
-        print(f"Branch: {state.branch}{ab}")
-    print()
+        out.append(f"Branch: {state.branch}{ab}")
+    out.append("")
     if issues:
-        print("Issues detected:")
-        for msg in issues:
-            print(f" - {msg}")
+        out.append("Issues detected:")
+        out.extend(f" - {msg}" for msg in issues)
     else:
-        print("No immediate issues detected.")
-    print()
-    print("Suggestions:")
-    for s in suggestions:
-        print(f" - {s}")
+        out.append("No immediate issues detected.")
+    out.append("")
+    out.append("Suggestions:")
+    out.extend(f" - {s}" for s in suggestions)
+    _write_lines(out)
 
 
 def interactive_show(state: RepoState, issues: List[str], suggestions: List[str]) -> None:
-    print()
-    print("Interactive mode (no commands will be executed):")
-    print("Select suggestions to review. Run chosen commands manually in your shell.")
-    print()
-    for idx, s in enumerate(suggestions, start=1):
-        print(f" [{idx}] {s}")
-    print()
-    print("Press Enter to exit.")
+    out: List[str] = [
+        "",
+        "Interactive mode (no commands will be executed):",
+        "Select suggestions to review. Run chosen commands manually in your shell.",
+        "",
+    ]
+    out.extend(f" [{idx}] {s}" for idx, s in enumerate(suggestions, start=1))
+    out.append("")
+    out.append("Press Enter to exit.")
+    _write_lines(out)
+    sys.stdout.flush()
     try:
         _ = input("")
     except EOFError:
@@ -351,6 +942,24 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         action="store_true",
         help="Show an interactive (read-only) menu of suggestions.",
     )
+    parser.add_argument(
+        "--fast",
+        dest="fast",
+        action="store_true",
+        help="Skip the tracked-junk check, which lists every tracked file.",
+    )
+    parser.add_argument(
+        "--full-scan",
+        dest="full_scan",
+        action="store_true",
+        help="Scan the full contents of every staged file, not just files whose changes mention a secret cue.",
+    )
+    parser.add_argument(
+        "--scan-tree",
+        dest="scan_tree",
+        action="store_true",
+        help="Also sweep the whole working tree for secrets (uses ripgrep when installed).",
+    )
     args = parser.parse_args(argv)
 
     git_dir, is_repo = ensure_git_repo()
@@ -363,17 +972,21 @@ def main(argv: Optional[Sequence[str]] = None) -> int:
         print("Unable to determine Git repository state.")
         return 1
 
-    issues, suggestions = make_suggestions(state, args.override)
+    tree_hits = scan_tree(state.repo_root) if args.scan_tree else []
+    issues, suggestions, secret_hits = make_suggestions(
+        state, args.override, fast=args.fast, full_scan=args.full_scan, tree_hits=tree_hits
+    )
+    save_repo_cache(state, secret_hits)
     print_summary(state, issues, suggestions)
 
     if args.interactive and hasattr(sys.stdin, "isatty") and sys.stdin.isatty():
         interactive_show(state, issues, suggestions)
 
     # Exit code policy:
-    # - If secrets found and not overridden, return 2 (would block commit)
+    # - If secrets found (staged, or in the tree with --scan-tree) and not overridden,
+    #   return 2 (would block commit)
     # - Else 0
-    secret_hits = detect_secrets_in_staged(state.staged_files)
-    if secret_hits and not args.override:
+    if (secret_hits or tree_hits) and not args.override:
         return 2
     return 0
 